@@ -2,66 +2,155 @@
 # SmartStudy — 2025 Professional UI (single-file FastAPI app)
 # Fix: ensure buttons reliably bind by running all DOM code after DOMContentLoaded.
 
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
 
 # ---------- Naive Summarizer (pure Python) ----------
 import re
-from collections import Counter, defaultdict
+import heapq
+import functools
+from collections import Counter, OrderedDict
+from typing import List, Tuple
+
+# numpy is optional; it backs the Numba scorer and the OCR binarization.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
 
-STOPWORDS = set("""
+STOPWORDS = frozenset("""
 a an the and is are was were in on of for to with by that this it as at from be or
 about into over after before under between during through up down out off above below
 can could should would may might shall will just not no nor so such than then too very
 """.split())
 
+# Prefer RE2 (linear-time DFA) when installed; fall back to the stdlib engine.
+try:
+    import re2 as re_backend
+    RE2_AVAILABLE = True
+except Exception:
+    re_backend = re
+    RE2_AVAILABLE = False
+
+if RE2_AVAILABLE:
+    # RE2 has no lookbehind and ASCII-only \s and \w: capture the terminator
+    # and glue it back on, and spell out the stdlib's Unicode \s (NBSP,
+    # U+3000, \v, \x85, ...) and \w classes.
+    _WS = r'[\s\p{Z}\x0b\x1c-\x1f\x85]'
+    _SENT_RE = re_backend.compile(r'([.!?])' + _WS + '+')
+    _WORD_RE = re_backend.compile(r'[\p{L}\p{N}_]+')
+else:
+    _WS = r'\s'
+    _SENT_RE = re.compile(r'(?<=[.!?])\s+')
+    _WORD_RE = re.compile(r'\w+')
+
 def _tokenize_sentences(text: str):
-    sentences = re.split(r'(?<=[.!?])\s+', (text or "").strip())
+    sentences = _SENT_RE.split((text or "").strip())
+    if RE2_AVAILABLE:
+        sentences = [a + b for a, b in zip(sentences[::2], sentences[1::2] + [""])]
     return [s.strip() for s in sentences if s.strip()]
 
+# Texts longer than this are never memoized, here or in the route caches.
+_RESULT_CACHE_MAX_CHARS = 1024 * 1024
+
+@functools.lru_cache(maxsize=32)
+def _cached_sentences(text: str) -> Tuple[str, ...]:
+    return tuple(_tokenize_sentences(text))
+
+def _sentences(text: str) -> Tuple[str, ...]:
+    # Summarize -> flashcards on the same notes only splits sentences once.
+    if len(text or "") > _RESULT_CACHE_MAX_CHARS:
+        return tuple(_tokenize_sentences(text))
+    return _cached_sentences(text)
+
 def _tokenize_words(sentence: str):
-    words = re.findall(r'\w+', sentence.lower())
-    return [w for w in words if w not in STOPWORDS]
+    sw = STOPWORDS
+    findall = _WORD_RE.findall
+    return [w for w in findall(sentence.lower()) if w not in sw]
+
+# Optional Numba kernel for scoring large notes; pure Python is used otherwise.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except Exception:
+    NUMBA_AVAILABLE = False
+
+_JIT_MIN_CHARS = 4096
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def score_sentences(word_ids, offsets, vocab_size):
+        freq = np.zeros(vocab_size, dtype=np.int64)
+        for j in range(word_ids.shape[0]):
+            freq[word_ids[j]] += 1
+        n = offsets.shape[0] - 1
+        scores = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            total = 0
+            for j in range(offsets[i], offsets[i + 1]):
+                total += freq[word_ids[j]]
+            scores[i] = total
+        return scores
+
+    # Warm up the JIT so the first request doesn't pay the compile cost.
+    score_sentences(np.zeros(1, dtype=np.int32), np.array([0, 1], dtype=np.int32), 1)
+
+def _score_tokens_jit(tokens: List[List[str]]) -> List[int]:
+    vocab = {}
+    word_ids = []
+    offsets = [0]
+    for t in tokens:
+        for w in t:
+            word_ids.append(vocab.setdefault(w, len(vocab)))
+        offsets.append(len(word_ids))
+    scores = score_sentences(
+        np.array(word_ids, dtype=np.int32),
+        np.array(offsets, dtype=np.int32),
+        max(len(vocab), 1),
+    )
+    return scores.tolist()
 
 def summarize(text: str, max_sentences: int = 3) -> str:
-    sents = _tokenize_sentences(text)
+    sents = _sentences(text)
     if not sents:
         return ""
     if len(sents) <= max_sentences:
         return " ".join(sents)
-    freq = Counter()
-    for s in sents:
-        for w in _tokenize_words(s):
-            freq[w] += 1
-    scores = defaultdict(int)
-    for i, s in enumerate(sents):
-        for w in _tokenize_words(s):
-            scores[i] += freq[w]
-    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    idx = sorted(i for i, _ in ranked[:max_sentences])
+    tokens = [_tokenize_words(s) for s in sents]
+    if NUMBA_AVAILABLE and len(text) >= _JIT_MIN_CHARS:
+        scores = _score_tokens_jit(tokens)
+    else:
+        freq = Counter(w for t in tokens for w in t)
+        scores = [sum(freq[w] for w in t) for t in tokens]
+    # Sentences made only of stopwords are never picked.
+    ranked = [i for i, t in enumerate(tokens) if t]
+    top = heapq.nlargest(max_sentences, ranked, key=scores.__getitem__)
+    idx = sorted(top)
     return " ".join(sents[i] for i in idx)
 
 # ---------- Flashcard Generator (rule-based) ----------
-from typing import List, Tuple
 
-def _sent_split(text: str) -> List[str]:
-    sents = re.split(r'(?<=[.!?])\s+', (text or "").strip())
-    return [s.strip() for s in sents if s.strip()]
+# One pass for both rules. Top-level alternation keeps the "is" rule's
+# priority over "has", exactly as the two separate searches did.
+_QA_RE = re_backend.compile(
+    rf'(?i)^(?:(.*?){_WS}+(?:is|are|was|were){_WS}+(.*)|(.*?){_WS}+has{_WS}+(.*))'
+)
 
 def _qa_from_sentence(sentence: str) -> Tuple[str, str]:
     s = sentence.strip()
 
-    m = re.search(r'^(.*?)\s+(is|are|was|were)\s+(.*)', s, re.IGNORECASE)
+    m = _QA_RE.match(s)
     if m:
-        subject = m.group(1).strip()
-        rest = m.group(3).strip()
-        return (f"What is {subject}?", rest.rstrip(".!?"))
-
-    m2 = re.search(r'^(.*?)\s+has\s+(.*)', s, re.IGNORECASE)
-    if m2:
-        subject = m2.group(1).strip()
-        obj = m2.group(2).strip()
+        if m.group(1) is not None:
+            subject = m.group(1).strip()
+            rest = m.group(2).strip()
+            return (f"What is {subject}?", rest.rstrip(".!?"))
+        subject = m.group(3).strip()
+        obj = m.group(4).strip()
         return (f"What does {subject} have?", obj.rstrip(".!?"))
 
     words = s.split()
@@ -70,24 +159,42 @@ def _qa_from_sentence(sentence: str) -> Tuple[str, str]:
     return (f"Question: {s[:40]}...", s)
 
 def generate_flashcards(text: str, max_cards: int = 10) -> List[Tuple[str, str]]:
-    cards = []
-    for sent in _sent_split(text):
-        q, a = _qa_from_sentence(sent)
-        cards.append((q, a))
-        if len(cards) >= max_cards:
-            break
-    return cards
+    sents = _sentences(text)[:max_cards]
+    return [_qa_from_sentence(s) for s in sents]
 
 # ---------- OCR Utilities ----------
 from PIL import Image
 import io
+import os
+import asyncio
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 try:
     import pytesseract
     TESS_AVAILABLE = True
 except Exception:
     TESS_AVAILABLE = False
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except Exception:
+    TESSEROCR_AVAILABLE = False
+
+MAX_UPLOAD_BYTES = 12 * 1024 * 1024
 
+# Tesseract's cost scales with pixel count; larger pages are shrunk to this.
+_OCR_MAX_SIDE = 1600
+
+@functools.lru_cache(maxsize=1)
 def available_languages() -> List[str]:
+    if TESSEROCR_AVAILABLE:
+        try:
+            return list(tesserocr.get_languages()[1])
+        except Exception:
+            pass
     if not TESS_AVAILABLE:
         return ["eng"]
     try:
@@ -95,18 +202,97 @@ def available_languages() -> List[str]:
     except Exception:
         return ["eng"]
 
+_INSTALLED = frozenset(available_languages())
+
+def _container_suffix(file_bytes: bytes):
+    """Return a file suffix if Tesseract can read these bytes as-is, else None."""
+    if file_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if file_bytes.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    return None
+
+def _otsu(arr) -> int:
+    hist = np.bincount(arr.ravel(), minlength=256).astype(np.float64)
+    omega = np.cumsum(hist) / arr.size
+    mu = np.cumsum(hist * np.arange(256)) / arr.size
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_b = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    sigma_b[~np.isfinite(sigma_b)] = 0.0
+    return int(np.argmax(sigma_b))
+
+def _preprocess(image: "Image.Image") -> "Image.Image":
+    """Grayscale, downscale to _OCR_MAX_SIDE and (with numpy) Otsu-binarize."""
+    img = image.convert("L")
+    if max(img.size) > _OCR_MAX_SIDE:
+        img.thumbnail((_OCR_MAX_SIDE, _OCR_MAX_SIDE), Image.LANCZOS)
+    if NUMPY_AVAILABLE:
+        arr = np.asarray(img)
+        thr = _otsu(arr)
+        img = Image.fromarray((arr > thr).astype("uint8") * 255)
+    return img
+
+# With tesserocr, loaded TessBaseAPI objects are kept warm between calls
+# instead of spawning tesseract (and re-reading traineddata) every time.
+# An API object is not thread-safe, so each call checks one out for its own
+# exclusive use; _TESS_LOCK only guards the idle pool, never an OCR run.
+# The pool is bounded: at most _TESS_MAX_LANG_SETS language sets, each with
+# at most _TESS_IDLE_PER_LANG idle objects; the rest are ended.
+_TESS_MAX_LANG_SETS = 4
+_TESS_IDLE_PER_LANG = 2
+_TESS_IDLE = OrderedDict()
+_TESS_LOCK = threading.Lock()
+
+def _tess_checkout(key: str):
+    with _TESS_LOCK:
+        idle = _TESS_IDLE.get(key)
+        if idle:
+            _TESS_IDLE.move_to_end(key)
+            return idle.pop()
+    return tesserocr.PyTessBaseAPI(lang=key)
+
+def _tess_checkin(key: str, api) -> None:
+    retired = []
+    with _TESS_LOCK:
+        idle = _TESS_IDLE.setdefault(key, [])
+        _TESS_IDLE.move_to_end(key)
+        if len(idle) < _TESS_IDLE_PER_LANG:
+            idle.append(api)
+        else:
+            retired.append(api)
+        while len(_TESS_IDLE) > _TESS_MAX_LANG_SETS:
+            retired.extend(_TESS_IDLE.popitem(last=False)[1])
+    for old in retired:
+        old.End()
+
+def _tesserocr_text(image: "Image.Image", lang_arg: str) -> str:
+    # lang_arg is already deduplicated in the caller's order; the order is
+    # kept in the key because Tesseract treats the first language as primary.
+    api = _tess_checkout(lang_arg)
+    try:
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    finally:
+        _tess_checkin(lang_arg, api)
+
 def ocr_image_bytes(file_bytes: bytes, lang: str = "eng") -> str:
-    if not TESS_AVAILABLE:
+    if not (TESS_AVAILABLE or TESSEROCR_AVAILABLE):
         raise RuntimeError("Tesseract not available. Install system package. (ગુજરાતી: Tesseract ઇન્સ્ટોલ કરો.)")
 
-    if len(file_bytes) > 12 * 1024 * 1024:
+    if len(file_bytes) > MAX_UPLOAD_BYTES:
         raise RuntimeError("File too large (>12MB). Please use a smaller image.")
 
+    # Image.open only reads the header. PNG/JPEG that are already small go to
+    # Tesseract untouched; everything else is decoded and preprocessed.
     image = Image.open(io.BytesIO(file_bytes))
+    suffix = _container_suffix(file_bytes)
+    raw = bool(suffix) and max(image.size) <= _OCR_MAX_SIDE
+    if not raw:
+        image = _preprocess(image)
 
     requested = [l.strip() for l in (lang or "eng").split("+") if l.strip()]
-    installed = set(available_languages())
-    missing = [l for l in requested if l not in installed]
+    # Plain English (the default) ships with every Tesseract install.
+    missing = [] if requested in ([], ["eng"]) else [l for l in requested if l not in _INSTALLED]
     if missing:
         raise RuntimeError(
             "Missing language data: "
@@ -114,20 +300,105 @@ def ocr_image_bytes(file_bytes: bytes, lang: str = "eng") -> str:
             + ". Install the missing .traineddata files. "
             + "(ગુજરાતી: જરૂરી ભાષાની .traineddata ફાઇલ ઇન્સ્ટોલ કરો.)"
         )
-    lang_arg = "+".join(requested) if requested else "eng"
+    # Deduplicate but keep the order: the first language is the primary one.
+    lang_arg = "+".join(dict.fromkeys(requested)) if requested else "eng"
+    if TESSEROCR_AVAILABLE:
+        return _tesserocr_text(image, lang_arg)
+    if raw:
+        image.close()
+        # Closed before Tesseract opens it: Windows won't let a second
+        # process open a NamedTemporaryFile that is still held open.
+        tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        try:
+            with tmp:
+                tmp.write(file_bytes)
+            return pytesseract.image_to_string(tmp.name, lang=lang_arg)
+        finally:
+            os.unlink(tmp.name)
     return pytesseract.image_to_string(image, lang=lang_arg)
 
+# Tesseract is single-threaded per image, so batches fan out across processes.
+# Each worker keeps its own warm TessBaseAPI when tesserocr is installed.
+# Workers are spawned, not forked, so they never inherit a held _TESS_LOCK
+# or a copied TessBaseAPI from a thread-pool thread.
+# The pool is created on the first batch request. By default it splits the
+# cores between the uvicorn workers (WEB_CONCURRENCY). SMARTSTUDY_OCR_PROCS
+# overrides the size.
+_POOL = None
+
+def _ocr_pool_size() -> int:
+    try:
+        if os.environ.get("SMARTSTUDY_OCR_PROCS"):
+            return max(1, int(os.environ["SMARTSTUDY_OCR_PROCS"]))
+        workers = max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+    except ValueError:
+        workers = 1
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def _ocr_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=_ocr_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _POOL
+
+def _shutdown_ocr_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+def _ocr_worker(file_bytes: bytes, lang: str = "eng") -> dict:
+    try:
+        return {"text": ocr_image_bytes(file_bytes, lang=lang), "lang": lang}
+    except Exception as e:
+        return {"error": str(e)}
+
 # ---------- FastAPI App ----------
-app = FastAPI(title="SmartStudy — Single File")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# orjson is optional; FastAPI's ORJSONResponse needs it at render time.
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+_DefaultJSON = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    _shutdown_ocr_pool()
+
+app = FastAPI(
+    title="SmartStudy — Single File",
+    default_response_class=_DefaultJSON,
+    lifespan=_lifespan,
 )
 
+# The UI is served from the same origin, so CORS is off unless explicit
+# origins are given, e.g. SMARTSTUDY_CORS_ORIGINS="https://example.com".
+_CORS_ORIGINS = [o.strip() for o in os.environ.get("SMARTSTUDY_CORS_ORIGINS", "").split(",") if o.strip()]
+if _CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["*"],
+    )
+class _GZipExceptIndex(GZipMiddleware):
+    """GZipMiddleware that leaves "/" alone; home() serves it pre-compressed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(_GZipExceptIndex, minimum_size=512)
+
 # ---------- UI (fixed JS: all bindings run after DOMContentLoaded) ----------
 INDEX_HTML = """
 <!doctype html>
@@ -523,10 +794,88 @@ window.addEventListener('DOMContentLoaded', function () {
 </html>
 """
 
+# Encode / compress the page once; home() just picks the right body.
+import gzip
+import hashlib
+
+_HTML_BYTES = INDEX_HTML.encode("utf-8")
+_HTML_GZ = gzip.compress(_HTML_BYTES, 6)
+# Strong ETags must differ per content-coding.
+_HTML_DIGEST = hashlib.md5(_HTML_BYTES).hexdigest()
+_HTML_ETAG = f'"{_HTML_DIGEST}"'
+_HTML_GZ_ETAG = f'"{_HTML_DIGEST}-gz"'
+_HTML_HEADERS = {
+    "Cache-Control": "public, max-age=3600",
+    "Vary": "Accept-Encoding",
+}
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if gzip (or *) is listed with a non-zero q-value."""
+    qvalues = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
 # ---------- Routes ----------
+# Texts at least this long are summarized / carded on the thread pool so they
+# don't block the event loop.
+_THREADPOOL_MIN_CHARS = 32 * 1024
+
+# Small LRU of summaries / flashcards keyed by (blake2b(text), limit), so
+# re-clicking on the same notes is free. Texts over 1MB are never cached.
+_RESULT_CACHE_SIZE = 256
+_summary_cache = OrderedDict()
+_flashcard_cache = OrderedDict()
+
+def _result_key(text: str, limit: int):
+    if len(text) > _RESULT_CACHE_MAX_CHARS:
+        return None
+    return (hashlib.blake2b(text.encode("utf-8")).hexdigest(), limit)
+
+def _cache_get(cache: OrderedDict, key):
+    if key is None or key not in cache:
+        return None
+    cache.move_to_end(key)
+    return cache[key]
+
+def _cache_put(cache: OrderedDict, key, value) -> None:
+    if key is None:
+        return
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _RESULT_CACHE_SIZE:
+        cache.popitem(last=False)
+
 @app.get("/", response_class=HTMLResponse)
-def home():
-    return INDEX_HTML
+def home(request: Request):
+    gz = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {**_HTML_HEADERS, "ETag": _HTML_GZ_ETAG if gz else _HTML_ETAG}
+    if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if gz:
+        return Response(
+            content=_HTML_GZ,
+            media_type="text/html; charset=utf-8",
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+    return Response(content=_HTML_BYTES, media_type="text/html; charset=utf-8", headers=headers)
 
 @app.get("/ocr/langs")
 async def api_ocr_langs():
@@ -540,23 +889,99 @@ async def api_summarize(payload: dict):
         k = int(k)
     except Exception:
         k = 3
-    return {"summary": summarize(text, k)}
+    text = text or ""
+    key = _result_key(text, k)
+    summary = _cache_get(_summary_cache, key)
+    if summary is None:
+        if len(text) >= _THREADPOOL_MIN_CHARS:
+            summary = await run_in_threadpool(summarize, text, k)
+        else:
+            summary = summarize(text, k)
+        _cache_put(_summary_cache, key, summary)
+    return {"summary": summary}
 
 @app.post("/flashcards")
 async def api_flashcards(payload: dict):
     text = (payload or {}).get("text", "")
-    cards = generate_flashcards(text, max_cards=10)
+    text = text or ""
+    key = _result_key(text, 10)
+    cards = _cache_get(_flashcard_cache, key)
+    if cards is None:
+        if len(text) >= _THREADPOOL_MIN_CHARS:
+            cards = await run_in_threadpool(generate_flashcards, text, max_cards=10)
+        else:
+            cards = generate_flashcards(text, max_cards=10)
+        _cache_put(_flashcard_cache, key, cards)
     return [{"question": q, "answer": a} for q, a in cards]
 
+_TOO_LARGE = "File too large (>12MB). Please use a smaller image."
+
+# A batch may hold at most this many files / bytes in memory (and pickle to
+# the OCR workers) at once.
+MAX_BATCH_FILES = 20
+MAX_BATCH_BYTES = 48 * 1024 * 1024
+_BATCH_TOO_LARGE = f"Batch too large (max {MAX_BATCH_FILES} files, 48MB total)."
+
+async def _read_capped(upload: UploadFile, limit: int = MAX_UPLOAD_BYTES):
+    """Read an upload, or return None if it is larger than `limit`.
+
+    Starlette has already spooled the body and filled in `upload.size`, so
+    oversized files are rejected without reading them at all. When the size
+    is unknown, one read of limit + 1 bytes tells whether it fits.
+    """
+    if upload.size is not None and upload.size > limit:
+        return None
+    blob = await upload.read(limit + 1)
+    if len(blob) > limit:
+        return None
+    return blob
+
 @app.post("/ocr")
 async def api_ocr(file: UploadFile = File(...), lang: str = Form("eng")):
     try:
-        blob = await file.read()
-        text = ocr_image_bytes(blob, lang=lang)
+        blob = await _read_capped(file)
+        if blob is None:
+            return JSONResponse(status_code=413, content={"error": _TOO_LARGE})
+        text = await run_in_threadpool(ocr_image_bytes, blob, lang=lang)
         return {"text": text, "lang": lang}
     except Exception as e:
         return JSONResponse(status_code=200, content={"error": str(e)})
 
+@app.post("/ocr/batch")
+async def api_ocr_batch(files: List[UploadFile] = File(...), lang: str = Form("eng")):
+    if len(files) > MAX_BATCH_FILES:
+        return JSONResponse(status_code=413, content={"error": _BATCH_TOO_LARGE})
+    blobs = []
+    total = 0
+    for f in files:
+        blob = await _read_capped(f)
+        if blob is None:
+            return JSONResponse(status_code=413, content={"error": f"{f.filename}: {_TOO_LARGE}"})
+        total += len(blob)
+        if total > MAX_BATCH_BYTES:
+            return JSONResponse(status_code=413, content={"error": _BATCH_TOO_LARGE})
+        blobs.append(blob)
+    loop = asyncio.get_running_loop()
+    pool = _ocr_pool()
+    return await asyncio.gather(
+        *[loop.run_in_executor(pool, _ocr_worker, blob, lang) for blob in blobs]
+    )
+
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
-    uvicorn.run("smartstudy_single:app", host="0.0.0.0", port=8000, reload=True)
+    # SMARTSTUDY_DEBUG=1 keeps the old single-process auto-reload dev server.
+    if os.environ.get("SMARTSTUDY_DEBUG"):
+        uvicorn.run("smartstudy_single:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Exported so each worker can size its OCR pool to its share of cores.
+        workers = int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run(
+            "smartstudy_single:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+            http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        )
@@ -0,0 +1,100 @@
+import importlib.util
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import smartstudy_single
+
+
+def _load_copy(name, use_re2, monkeypatch):
+    """Import a private copy of the module with or without the re2 backend."""
+    if use_re2:
+        pytest.importorskip("re2")
+    else:
+        monkeypatch.setitem(sys.modules, "re2", None)
+    spec = importlib.util.spec_from_file_location(name, smartstudy_single.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_repeat_summarize_is_served_from_cache(monkeypatch):
+    calls = []
+    real_summarize = smartstudy_single.summarize
+
+    def counting_summarize(text, k):
+        calls.append((text, k))
+        return real_summarize(text, k)
+
+    monkeypatch.setattr(smartstudy_single, "summarize", counting_summarize)
+    smartstudy_single._summary_cache.clear()
+    client = TestClient(smartstudy_single.app)
+    payload = {
+        "text": "Cats are animals. Dogs has bones. Python is a language. Cats like python.",
+        "max_sentences": 2,
+    }
+
+    first = client.post("/summarize", json=payload)
+    second = client.post("/summarize", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert len(calls) == 1
+    assert len(smartstudy_single._summary_cache) == 1
+
+
+def test_ocr_batch_rejects_too_many_files():
+    client = TestClient(smartstudy_single.app)
+    files = [
+        ("files", (f"{i}.png", b"x", "image/png"))
+        for i in range(smartstudy_single.MAX_BATCH_FILES + 1)
+    ]
+
+    res = client.post("/ocr/batch", files=files, data={"lang": "eng"})
+
+    assert res.status_code == 413
+    assert "error" in res.json()
+
+
+def test_index_etag_depends_on_content_coding():
+    client = TestClient(smartstudy_single.app)
+
+    gz = client.get("/", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert gz.text == plain.text == smartstudy_single.INDEX_HTML
+    assert gz.headers["etag"] != plain.headers["etag"]
+
+    cached = client.get(
+        "/", headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+
+UNICODE_WS_NOTES = [
+    "Cells are small.\xa0Mitochondria is the powerhouse.\u3000Plants has chloroplasts.",
+    "Water is wet.\u2009Ice\u00a0is cold!\x85Steam was hot?\x0bFire has heat.",
+    "Atoms are tiny.\u2028Light\u202fwas fast. Sound\u205fhas waves.\x1fDone.",
+]
+
+
+@pytest.mark.parametrize("text", UNICODE_WS_NOTES)
+def test_re2_backend_matches_stdlib_on_unicode_whitespace(text, monkeypatch):
+    stdlib = _load_copy("_ss_stdlib", False, monkeypatch)
+    assert not stdlib.RE2_AVAILABLE
+    monkeypatch.delitem(sys.modules, "re2")
+    re2 = _load_copy("_ss_re2", True, monkeypatch)
+    assert re2.RE2_AVAILABLE
+
+    assert re2._tokenize_sentences(text) == stdlib._tokenize_sentences(text)
+    assert len(stdlib._tokenize_sentences(text)) > 1
+    assert re2.summarize(text, 2) == stdlib.summarize(text, 2)
+    assert re2.generate_flashcards(text) == stdlib.generate_flashcards(text)
+
+
+def test_summarize_skips_stopword_only_sentences():
+    assert smartstudy_single.summarize("is? cat. is x!! y!!", 3) == "cat. is x!! y!!"
+    assert smartstudy_single.summarize("is? are. was! the.", 3) == ""